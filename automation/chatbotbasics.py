@@ -10,24 +10,153 @@ Perfect for learning AI automation without requiring paid APIs.
 Author: Python AI Automation Lab
 """
 
+import hashlib
 import os
-from typing import List, Dict, Optional
+from array import array
+from collections import deque
+from typing import Any, Deque, List, Dict, Optional
 from colorama import init, Fore, Style
-from dotenv import load_dotenv
 
 # Initialize colorama for colored output
 init(autoreset=True)
 
-# Load environment variables
-load_dotenv()
+# Prompt and banner strings are constant, so format them once
+_PROMPT_YOU = f"{Fore.GREEN}You: {Style.RESET_ALL}"
+_PROMPT_BOT = f"{Fore.BLUE}Bot: {Style.RESET_ALL}"
+_BANNER = f"{Fore.CYAN}{'='*60}"
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton for finding response keywords in a message.
+    
+    The automaton is built once from the keyword table, after which any
+    message is scanned in a single pass regardless of how many keywords
+    there are. It is stored compactly so large keyword tables (e.g. an FAQ
+    loaded from a file) stay cheap: all transitions live in one flat dict
+    keyed by (state, character) packed into an int, per-state data sits in
+    typed arrays, and terminal states hold an index into the response list
+    rather than the response itself.
+    """
+    
+    # Bits needed for any Unicode code point
+    _CHAR_BITS = 21
+    
+    # Messages are case-folded this many characters at a time, so a match
+    # near the start of a long paste doesn't fold the rest of it
+    _FOLD_CHUNK = 256
+    
+    def __init__(self, responses: Dict[str, str]):
+        """
+        Build the automaton from a keyword -> response mapping.
+        
+        Args:
+            responses: Keywords mapped to their responses (matched
+                case-insensitively).
+                Earlier keywords win when several end at the same position.
+        """
+        self._responses: List[str] = list(responses.values())
+        
+        # Index of the winning keyword per state; len(responses) means none,
+        # so the earliest keyword is simply the smallest value
+        self._no_match = len(self._responses)
+        self._output = array('l', [self._no_match])
+        self._fail = array('l', [0])
+        
+        # Per-state child dicts are only needed while building
+        children: List[Dict[str, int]] = [{}]
+        for priority, keyword in enumerate(responses):
+            self._add_keyword(children, keyword.casefold(), priority)
+        
+        self._build_failure_links(children)
+        
+        self._transitions: Dict[int, int] = {
+            (state << self._CHAR_BITS) | ord(char): next_state
+            for state, edges in enumerate(children)
+            for char, next_state in edges.items()
+        }
+    
+    def _add_keyword(self, children: List[Dict[str, int]],
+                     keyword: str, priority: int) -> None:
+        """Insert a keyword into the trie, marking its terminal state."""
+        state = 0
+        for char in keyword:
+            next_state = children[state].get(char)
+            if next_state is None:
+                next_state = len(children)
+                children.append({})
+                self._fail.append(0)
+                self._output.append(self._no_match)
+                children[state][char] = next_state
+            state = next_state
+        
+        self._output[state] = min(self._output[state], priority)
+    
+    def _build_failure_links(self, children: List[Dict[str, int]]) -> None:
+        """Compute failure links breadth-first and merge outputs along them."""
+        queue = deque(children[0].values())
+        
+        while queue:
+            state = queue.popleft()
+            for char, next_state in children[state].items():
+                queue.append(next_state)
+                
+                fallback = self._fail[state]
+                while fallback and char not in children[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = children[fallback].get(char, 0)
+                
+                # A state also ends every keyword its failure state ends
+                self._output[next_state] = min(
+                    self._output[next_state],
+                    self._output[self._fail[next_state]]
+                )
+    
+    def find(self, text: str) -> Optional[str]:
+        """
+        Return the response for the first keyword found in the text.
+        
+        Args:
+            text: Message to scan, in any case
+            
+        Returns:
+            The matching response, or None if no keyword occurs
+        """
+        transitions = self._transitions
+        fail = self._fail
+        output = self._output
+        no_match = self._no_match
+        char_bits = self._CHAR_BITS
+        chunk = self._FOLD_CHUNK
+        state = 0
+        
+        # casefold() maps each character independently, so folding chunk by
+        # chunk gives the same characters as folding the whole message
+        for start in range(0, len(text), chunk):
+            for char in text[start:start + chunk].casefold():
+                code = ord(char)
+                next_state = transitions.get((state << char_bits) | code)
+                while next_state is None and state:
+                    state = fail[state]
+                    next_state = transitions.get((state << char_bits) | code)
+                state = next_state or 0
+                
+                if output[state] != no_match:
+                    return self._responses[output[state]]
+        
+        return None
 
 
 class LocalChatbot:
     """Simple rule-based chatbot for when OpenAI API is not available."""
     
+    # Only the most recent messages are kept, so long sessions use bounded memory
+    MAX_HISTORY = 200
+    
     def __init__(self):
         """Initialize the local chatbot with predefined responses."""
-        self.conversation_history: List[Dict[str, str]] = []
+        self.conversation_history: Deque[Dict[str, str]] = deque(maxlen=self.MAX_HISTORY)
+        self._turn = 0
         
         # Simple response patterns
         self.responses = {
@@ -40,6 +169,9 @@ class LocalChatbot:
             'weather': "I can't check the weather in local mode, but I hope it's nice where you are!",
             'name': "I'm a local chatbot - a simple AI without cloud APIs. I'm here to chat!",
         }
+        
+        # Build the keyword automaton once so each message is scanned in one pass
+        self._matcher = KeywordMatcher(self.responses)
     
     def get_response(self, user_message: str) -> str:
         """
@@ -51,23 +183,22 @@ class LocalChatbot:
         Returns:
             A response string
         """
+        self._turn += 1
+        
         # Store the conversation
         self.conversation_history.append({
             'role': 'user',
             'content': user_message
         })
         
-        # Convert to lowercase for matching
-        msg_lower = user_message.lower().strip()
-        
-        # Check for keyword matches
-        for keyword, response in self.responses.items():
-            if keyword in msg_lower:
-                self.conversation_history.append({
-                    'role': 'assistant',
-                    'content': response
-                })
-                return response
+        # Check for keyword matches (the matcher handles case-folding)
+        response = self._matcher.find(user_message)
+        if response is not None:
+            self.conversation_history.append({
+                'role': 'assistant',
+                'content': response
+            })
+            return response
         
         # Default responses for unknown inputs
         default_responses = [
@@ -77,7 +208,7 @@ class LocalChatbot:
         ]
         
         # Rotate through default responses
-        response = default_responses[len(self.conversation_history) % len(default_responses)]
+        response = default_responses[self._turn % len(default_responses)]
         
         self.conversation_history.append({
             'role': 'assistant',
@@ -100,12 +231,22 @@ class OpenAIChatbot:
         try:
             from openai import OpenAI
             self.client = OpenAI(api_key=api_key)
-            self.conversation_history: List[Dict[str, str]] = [
+            
+            # The request is laid out as static prefix + committed turns +
+            # per-turn tail. The first two parts are only ever appended to,
+            # so their bytes stay identical between requests and OpenAI's
+            # prompt prefix cache can reuse them.
+            self._static_prefix: List[Dict[str, str]] = [
                 {
                     "role": "system",
                     "content": "You are a helpful, friendly AI assistant. Keep responses concise and engaging."
                 }
             ]
+            self._committed: List[Dict[str, str]] = []
+            
+            # Once committed turns exceed this rough token budget, the oldest
+            # half is folded into a single summary message
+            self._max_history_tokens = 4000
             self.available = True
         except ImportError:
             self.available = False
@@ -114,12 +255,125 @@ class OpenAIChatbot:
             self.available = False
             print(f"{Fore.RED}Error initializing OpenAI: {str(e)}")
     
-    def get_response(self, user_message: str) -> Optional[str]:
+    @property
+    def conversation_history(self) -> List[Dict[str, str]]:
+        """The system prompt followed by every committed turn."""
+        return self._static_prefix + self._committed
+    
+    @staticmethod
+    def _estimate_tokens(message: Dict[str, str]) -> int:
+        """Roughly estimate a message's token count (about 4 chars per token)."""
+        return len(message["content"]) // 4
+    
+    def _compact_history(self) -> None:
+        """
+        Summarize the oldest committed turns once history grows too long.
+        
+        The oldest half of the committed messages is replaced by one summary
+        message, keeping each request a bounded size. If summarizing fails,
+        the history is left unchanged.
+        """
+        total = sum(self._estimate_tokens(m) for m in self._committed)
+        if total <= self._max_history_tokens:
+            return
+        
+        # Cut just before a user message so no turn is split in half
+        cutoff = len(self._committed) // 2
+        while cutoff < len(self._committed) and self._committed[cutoff]["role"] != "user":
+            cutoff += 1
+        if cutoff < 2:
+            return
+        
+        oldest = self._committed[:cutoff]
+        transcript = "\n".join(f"{m['role']}: {m['content']}" for m in oldest)
+        
+        try:
+            response = self.client.chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "Summarize this conversation in a few sentences, keeping any facts the user shared."
+                    },
+                    {
+                        "role": "user",
+                        "content": transcript
+                    }
+                ],
+                max_tokens=200,
+                temperature=0.3
+            )
+            summary = response.choices[0].message.content
+            
+            # content is None when, e.g., a content filter stopped the reply
+            if not summary:
+                raise ValueError("empty summary returned")
+        except Exception as e:
+            print(f"{Fore.YELLOW}⚠️  Could not summarize history: {str(e)}")
+            return
+        
+        self._committed[:cutoff] = [{
+            "role": "system",
+            "content": "Summary of earlier conversation: " + summary
+        }]
+    
+    def _assemble_messages(self,
+                           user_message: str,
+                           memory_items: Optional[List[Dict[str, Any]]] = None,
+                           context: Optional[str] = None) -> List[Dict[str, str]]:
+        """
+        Build the message list for one request.
+        
+        Memory items are sorted by content hash, then timestamp, so the same
+        set of items always produces the same bytes no matter what order
+        they were retrieved in.
+        
+        Args:
+            user_message: The user's input message
+            memory_items: Retrieved items with 'content' and optional 'ts'
+            context: Extra per-turn information
+            
+        Returns:
+            Static prefix + committed history + dynamic tail + user message
+        """
+        messages = self._static_prefix + self._committed
+        
+        if memory_items:
+            ordered = sorted(
+                memory_items,
+                key=lambda m: (hashlib.sha1(m["content"].encode()).hexdigest(), m.get("ts", 0))
+            )
+            messages.append({
+                "role": "system",
+                "content": "\n\n".join(m["content"] for m in ordered)
+            })
+        
+        if context:
+            messages.append({
+                "role": "system",
+                "content": context
+            })
+        
+        messages.append({
+            "role": "user",
+            "content": user_message
+        })
+        return messages
+    
+    def get_response(self, user_message: str,
+                     context: Optional[str] = None,
+                     memory_items: Optional[List[Dict[str, Any]]] = None) -> Optional[str]:
         """
         Get a response from OpenAI's GPT model.
         
         Args:
             user_message: The user's input message
+            context: Extra per-turn information (optional). It is sent after
+                the committed history and never stored, so it doesn't
+                disturb the cached prefix.
+            memory_items: Retrieved memory/RAG items (optional), each a dict
+                with 'content' and an optional 'ts'. Like context, they are
+                sent for this turn only.
             
         Returns:
             AI-generated response or None if error occurs
@@ -128,16 +382,16 @@ class OpenAIChatbot:
             return None
         
         try:
-            # Add user message to history
-            self.conversation_history.append({
-                "role": "user",
-                "content": user_message
-            })
+            # Keep the request size bounded on long sessions
+            self._compact_history()
+            
+            # Build the request without touching the stable prefix
+            messages = self._assemble_messages(user_message, memory_items, context)
             
             # Get response from OpenAI
             response = self.client.chat.completions.create(
                 model="gpt-3.5-turbo",
-                messages=self.conversation_history,
+                messages=messages,
                 max_tokens=150,
                 temperature=0.7
             )
@@ -145,8 +399,9 @@ class OpenAIChatbot:
             # Extract the assistant's message
             assistant_message = response.choices[0].message.content
             
-            # Add to history
-            self.conversation_history.append({
+            # Commit the completed turn to history
+            self._committed.append(messages[-1])
+            self._committed.append({
                 "role": "assistant",
                 "content": assistant_message
             })
@@ -160,9 +415,13 @@ class OpenAIChatbot:
 
 def main():
     """Main function to run the chatbot."""
-    print(f"\n{Fore.CYAN}{'='*60}")
+    # Load environment variables only when running the CLI, not on import
+    from dotenv import load_dotenv
+    load_dotenv()
+    
+    print(f"\n{_BANNER}")
     print(f"{Fore.CYAN}🤖 AI Chatbot")
-    print(f"{Fore.CYAN}{'='*60}\n")
+    print(f"{_BANNER}\n")
     
     # Check for OpenAI API key
     api_key = os.getenv("OPENAI_API_KEY")
@@ -190,13 +449,13 @@ def main():
         print(f"{Fore.GREEN}☁️  Running in OPENAI MODE - AI-powered responses")
     
     print(f"{Fore.CYAN}Type 'quit' or 'exit' to end the conversation\n")
-    print(f"{Fore.CYAN}{'='*60}\n")
+    print(f"{_BANNER}\n")
     
     # Chat loop
     while True:
         try:
             # Get user input
-            user_input = input(f"{Fore.GREEN}You: {Style.RESET_ALL}").strip()
+            user_input = input(_PROMPT_YOU).strip()
             
             # Check for exit commands
             if user_input.lower() in ['quit', 'exit', 'bye', 'goodbye']:
@@ -211,7 +470,7 @@ def main():
             response = chatbot.get_response(user_input)
             
             if response:
-                print(f"{Fore.BLUE}Bot: {Style.RESET_ALL}{response}\n")
+                print(f"{_PROMPT_BOT}{response}\n")
             else:
                 # Fallback to local mode if OpenAI fails
                 if mode == "OPENAI":
@@ -219,7 +478,7 @@ def main():
                     chatbot = LocalChatbot()
                     mode = "LOCAL"
                     response = chatbot.get_response(user_input)
-                    print(f"{Fore.BLUE}Bot: {Style.RESET_ALL}{response}\n")
+                    print(f"{_PROMPT_BOT}{response}\n")
         
         except KeyboardInterrupt:
             print(f"\n\n{Fore.CYAN}👋 Chat interrupted. Goodbye!\n")
@@ -13,22 +13,26 @@ reminders, or batch communications.
 Author: Python AI Automation Lab
 """
 
+import base64
+import io
 import os
 import smtplib
+from collections import deque
+from contextlib import contextmanager
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
-from email import encoders
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional
 from colorama import init, Fore, Style
-from dotenv import load_dotenv
 
 # Initialize colorama
 init(autoreset=True)
 
-# Load environment variables (NEVER logged, NEVER committed)
-load_dotenv()
+# Prompt and banner strings are constant, so format them once
+_BANNER = f"{Fore.CYAN}{'='*60}"
+_CONFIRM_BANNER = f"{Fore.YELLOW}{'='*60}"
+_PROMPT_FILE = f"{Fore.CYAN}  File: {Style.RESET_ALL}"
 
 
 class EmailBot:
@@ -49,6 +53,42 @@ class EmailBot:
         'yahoo': ('smtp.mail.yahoo.com', 587),
     }
     
+    # Email domains and the provider whose SMTP server they use. Matched
+    # exactly, so custom domains (e.g. live.acme.io) get the unknown-provider
+    # warning. Regional domains are listed only when they share the main
+    # provider's server (yahoo.co.jp, for example, does not).
+    _DOMAIN_TO_PROVIDER = {
+        'gmail.com': 'gmail',
+        'googlemail.com': 'gmail',
+        'outlook.com': 'outlook',
+        'outlook.de': 'outlook',
+        'outlook.fr': 'outlook',
+        'outlook.es': 'outlook',
+        'outlook.it': 'outlook',
+        'hotmail.com': 'outlook',
+        'hotmail.co.uk': 'outlook',
+        'hotmail.de': 'outlook',
+        'hotmail.fr': 'outlook',
+        'hotmail.es': 'outlook',
+        'hotmail.it': 'outlook',
+        'live.com': 'outlook',
+        'live.co.uk': 'outlook',
+        'live.de': 'outlook',
+        'live.fr': 'outlook',
+        'msn.com': 'outlook',
+        'yahoo.com': 'yahoo',
+        'yahoo.co.uk': 'yahoo',
+        'yahoo.de': 'yahoo',
+        'yahoo.fr': 'yahoo',
+        'yahoo.es': 'yahoo',
+        'yahoo.it': 'yahoo',
+        'yahoo.ca': 'yahoo',
+        'yahoo.com.au': 'yahoo',
+        'yahoo.co.in': 'yahoo',
+        'ymail.com': 'yahoo',
+        'rocketmail.com': 'yahoo',
+    }
+    
     def __init__(self, email_address: Optional[str] = None, 
                  email_password: Optional[str] = None):
         """
@@ -58,6 +98,11 @@ class EmailBot:
             email_address: Sender email (or set EMAIL_ADDRESS in .env)
             email_password: App password (or set EMAIL_PASSWORD in .env)
         """
+        # Load environment variables (NEVER logged, NEVER committed).
+        # Deferred to here so importing this module doesn't read .env.
+        from dotenv import load_dotenv
+        load_dotenv()
+        
         # Get credentials from environment or parameters
         self.email_address = email_address or os.getenv("EMAIL_ADDRESS")
         self.email_password = email_password or os.getenv("EMAIL_PASSWORD")
@@ -77,6 +122,9 @@ class EmailBot:
         
         # Determine SMTP server based on email domain
         self.smtp_server, self.smtp_port = self._get_smtp_config()
+        
+        # Open connection while inside session(), reused by send_email
+        self._server: Optional[smtplib.SMTP] = None
     
     def _get_smtp_config(self) -> tuple:
         """
@@ -85,18 +133,194 @@ class EmailBot:
         Returns:
             Tuple of (smtp_server, port)
         """
-        email_lower = self.email_address.lower()
-        
-        if 'gmail' in email_lower:
-            return self.SMTP_SERVERS['gmail']
-        elif 'outlook' in email_lower or 'hotmail' in email_lower:
-            return self.SMTP_SERVERS['outlook']
-        elif 'yahoo' in email_lower:
-            return self.SMTP_SERVERS['yahoo']
-        else:
+        domain = self.email_address.rsplit('@', 1)[-1].lower()
+        provider = self._DOMAIN_TO_PROVIDER.get(domain)
+        
+        if provider is None:
             # Default to Gmail settings for unknown providers
             print(f"{Fore.YELLOW}⚠️  Unknown email provider, using Gmail SMTP")
-            return self.SMTP_SERVERS['gmail']
+            provider = 'gmail'
+        
+        return self.SMTP_SERVERS[provider]
+    
+    def _connect(self) -> smtplib.SMTP:
+        """
+        Open a secure, logged-in connection to the SMTP server.
+        
+        Returns:
+            Connected SMTP client (caller is responsible for closing it)
+        """
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+        try:
+            server.ehlo()
+            server.starttls()  # Secure the connection
+            server.ehlo()  # Re-identify over TLS, required by strict servers
+            
+            # Login (password is NEVER logged)
+            server.login(self.email_address, self.email_password)
+        except Exception:
+            server.close()
+            raise
+        return server
+    
+    @contextmanager
+    def session(self) -> Iterator["EmailBot"]:
+        """
+        Keep one SMTP connection open for several send_email calls.
+        
+        The TCP, TLS and login handshakes happen once for the whole block
+        instead of once per email.
+        
+        Example:
+            with bot.session():
+                bot.send_email(...)
+                bot.send_email(...)
+        """
+        with self._connect() as server:
+            self._server = server
+            try:
+                yield self
+            finally:
+                self._server = None
+    
+    def send_many(self, messages: List[Dict]) -> int:
+        """
+        Send several emails over a single SMTP connection.
+        
+        If the server drops the connection, it is reopened once and the
+        interrupted email is retried. If it drops again before that email
+        goes out, the remaining emails are not attempted.
+        
+        Args:
+            messages: List of keyword-argument dicts for send_email
+            
+        Returns:
+            Number of emails sent successfully
+        """
+        sent = 0
+        index = 0
+        retried_index = None
+        
+        while index < len(messages):
+            try:
+                with self.session() as bot:
+                    while index < len(messages):
+                        message = messages[index]
+                        try:
+                            msg = bot._build_mime(**message)
+                            bot._send_via(bot._server, msg, message['to_email'])
+                            sent += 1
+                        except smtplib.SMTPServerDisconnected:
+                            raise
+                        except Exception as e:
+                            print(f"{Fore.RED}❌ Error sending email: {str(e)}")
+                        index += 1
+            except smtplib.SMTPServerDisconnected:
+                if retried_index == index:
+                    print(f"{Fore.RED}❌ Connection lost again, "
+                          f"{len(messages) - index} email(s) not sent")
+                    break
+                print(f"{Fore.YELLOW}⚠️  Connection lost, reconnecting...")
+                retried_index = index
+            except smtplib.SMTPAuthenticationError:
+                self._print_auth_help()
+                break
+            except Exception as e:
+                print(f"{Fore.RED}❌ Error sending emails: {str(e)}")
+                break
+        
+        return sent
+    
+    async def send_many_async(self, messages: List[Dict], concurrency: int = 5) -> int:
+        """
+        Send several emails over a few concurrent SMTP connections.
+        
+        Requires the optional aiosmtplib package. Up to `concurrency`
+        connections are opened, each logging in once and then sending
+        messages from the shared queue until it runs out. If a connection
+        drops, its current message goes back on the queue for the other
+        connections. Keep concurrency low enough to stay within your
+        provider's rate limits.
+        
+        Example:
+            asyncio.run(bot.send_many_async(messages))
+        
+        Args:
+            messages: List of keyword-argument dicts for send_email
+            concurrency: Maximum number of simultaneous connections
+            
+        Returns:
+            Number of emails sent successfully
+        """
+        try:
+            import aiosmtplib
+        except ImportError:
+            print(f"{Fore.RED}aiosmtplib package not installed. Run: pip install aiosmtplib")
+            return 0
+        
+        # Imported here so the sync-only paths don't pay asyncio's import cost
+        import asyncio
+        
+        # Errors that mean the connection itself is gone
+        connection_errors = (
+            aiosmtplib.SMTPServerDisconnected,
+            aiosmtplib.SMTPConnectError,
+            aiosmtplib.SMTPTimeoutError,
+            ConnectionError,
+        )
+        
+        loop = asyncio.get_running_loop()
+        pending = deque(messages)
+        sent = 0
+        
+        async def worker() -> None:
+            nonlocal sent
+            client = aiosmtplib.SMTP(hostname=self.smtp_server, port=self.smtp_port,
+                                     start_tls=True)
+            await client.connect()
+            try:
+                # Login (password is NEVER logged)
+                await client.login(self.email_address, self.email_password)
+                
+                # Workers share one queue, so each message is sent once
+                while pending:
+                    message = pending.popleft()
+                    try:
+                        # Reading and encoding attachments is blocking file
+                        # I/O, so keep it off the event loop
+                        msg = await loop.run_in_executor(
+                            None, lambda: self._build_mime(**message)
+                        )
+                        await client.send_message(msg)
+                        print(f"{Fore.GREEN}✓ Email sent successfully to {message['to_email']}")
+                        sent += 1
+                    except connection_errors as e:
+                        # Hand the message to the remaining connections
+                        pending.appendleft(message)
+                        print(f"{Fore.YELLOW}⚠️  Connection lost: {str(e)}")
+                        return
+                    except Exception as e:
+                        print(f"{Fore.RED}❌ Error sending email: {str(e)}")
+            finally:
+                try:
+                    await client.quit()
+                except Exception:
+                    client.close()
+        
+        workers = min(max(1, concurrency), len(messages))
+        results = await asyncio.gather(*(worker() for _ in range(workers)),
+                                       return_exceptions=True)
+        
+        errors = [r for r in results if isinstance(r, Exception)]
+        if any(isinstance(e, aiosmtplib.SMTPAuthenticationError) for e in errors):
+            self._print_auth_help()
+        elif errors:
+            print(f"{Fore.RED}❌ Error sending emails: {str(errors[0])}")
+        
+        if pending:
+            print(f"{Fore.RED}❌ {len(pending)} email(s) not sent")
+        
+        return sent
     
     def send_email(self, 
                    to_email: str, 
@@ -118,44 +342,79 @@ class EmailBot:
             True if successful, False otherwise
         """
         try:
-            # Create message
-            msg = MIMEMultipart()
-            msg['From'] = self.email_address
-            msg['To'] = to_email
-            msg['Subject'] = subject
-            
-            # Attach body
-            mime_type = 'html' if html else 'plain'
-            msg.attach(MIMEText(body, mime_type))
-            
-            # Attach files if provided
-            if attachments:
-                for file_path in attachments:
-                    self._attach_file(msg, file_path)
+            msg = self._build_mime(to_email, subject, body, attachments, html)
             
-            # Send email via SMTP
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()  # Secure the connection
-                
-                # Login (password is NEVER logged)
-                server.login(self.email_address, self.email_password)
-                
-                # Send email
-                server.send_message(msg)
+            # Send email via SMTP, reusing the session connection if open
+            if self._server is not None:
+                self._send_via(self._server, msg, to_email)
+            else:
+                with self._connect() as server:
+                    self._send_via(server, msg, to_email)
             
-            print(f"{Fore.GREEN}✓ Email sent successfully to {to_email}")
             return True
             
         except smtplib.SMTPAuthenticationError:
-            print(f"{Fore.RED}❌ Authentication failed!")
-            print(f"{Fore.YELLOW}⚠️  Make sure you're using an APP PASSWORD, not your main password")
-            print(f"{Fore.CYAN}Gmail users: https://myaccount.google.com/apppasswords")
+            self._print_auth_help()
             return False
             
         except Exception as e:
             print(f"{Fore.RED}❌ Error sending email: {str(e)}")
             return False
     
+    def _build_mime(self,
+                    to_email: str,
+                    subject: str,
+                    body: str,
+                    attachments: Optional[List[str]] = None,
+                    html: bool = False) -> MIMEMultipart:
+        """
+        Create the email message, ready to send.
+        
+        Args:
+            to_email: Recipient email address
+            subject: Email subject
+            body: Email body content
+            attachments: List of file paths to attach (optional)
+            html: If True, send body as HTML instead of plain text
+            
+        Returns:
+            Email message object
+        """
+        msg = MIMEMultipart()
+        msg['From'] = self.email_address
+        msg['To'] = to_email
+        msg['Subject'] = subject
+        
+        # Attach body
+        mime_type = 'html' if html else 'plain'
+        msg.attach(MIMEText(body, mime_type))
+        
+        # Attach files if provided
+        if attachments:
+            for file_path in attachments:
+                self._attach_file(msg, file_path)
+        
+        return msg
+    
+    def _send_via(self, server: smtplib.SMTP, msg: MIMEMultipart, to_email: str) -> None:
+        """
+        Send a prepared message over an open connection.
+        
+        Args:
+            server: Connected, logged-in SMTP client
+            msg: Email message object
+            to_email: Recipient email address (for the status message)
+        """
+        server.send_message(msg)
+        print(f"{Fore.GREEN}✓ Email sent successfully to {to_email}")
+    
+    @staticmethod
+    def _print_auth_help() -> None:
+        """Explain the usual cause of an SMTP authentication failure."""
+        print(f"{Fore.RED}❌ Authentication failed!")
+        print(f"{Fore.YELLOW}⚠️  Make sure you're using an APP PASSWORD, not your main password")
+        print(f"{Fore.CYAN}Gmail users: https://myaccount.google.com/apppasswords")
+    
     def _attach_file(self, msg: MIMEMultipart, file_path: str) -> None:
         """
         Attach a file to the email message.
@@ -171,11 +430,15 @@ class EmailBot:
                 print(f"{Fore.YELLOW}⚠️  File not found: {file_path}")
                 return
             
+            # Encode while reading in small chunks, so the raw file is never
+            # held in memory alongside its base64 form
+            encoded = io.BytesIO()
             with open(path, 'rb') as f:
-                part = MIMEBase('application', 'octet-stream')
-                part.set_payload(f.read())
+                base64.encode(f, encoded)
             
-            encoders.encode_base64(part)
+            part = MIMEBase('application', 'octet-stream')
+            part.set_payload(encoded.getvalue().decode('ascii'))
+            part['Content-Transfer-Encoding'] = 'base64'
             part.add_header(
                 'Content-Disposition',
                 f'attachment; filename= {path.name}'
@@ -190,9 +453,9 @@ class EmailBot:
 
 def main():
     """Main function to run the email bot."""
-    print(f"\n{Fore.CYAN}{'='*60}")
+    print(f"\n{_BANNER}")
     print(f"{Fore.CYAN}📧 Email Automation Bot")
-    print(f"{Fore.CYAN}{'='*60}\n")
+    print(f"{_BANNER}\n")
     
     # Security warning
     print(f"{Fore.RED}⚠️  SECURITY REMINDER:")
@@ -229,19 +492,19 @@ def main():
         if attach in ['yes', 'y']:
             print(f"{Fore.YELLOW}Enter file paths (one per line, empty line to finish):")
             while True:
-                file_path = input(f"{Fore.CYAN}  File: {Style.RESET_ALL}").strip()
+                file_path = input(_PROMPT_FILE).strip()
                 if not file_path:
                     break
                 attachments.append(file_path)
         
         # Confirm before sending
-        print(f"\n{Fore.YELLOW}{'='*60}")
+        print(f"\n{_CONFIRM_BANNER}")
         print(f"{Fore.YELLOW}Ready to send!")
         print(f"{Fore.YELLOW}To: {to_email}")
         print(f"{Fore.YELLOW}Subject: {subject}")
         if attachments:
             print(f"{Fore.YELLOW}Attachments: {len(attachments)} file(s)")
-        print(f"{Fore.YELLOW}{'='*60}\n")
+        print(f"{_CONFIRM_BANNER}\n")
         
         confirm = input(f"{Fore.CYAN}Send email? (yes/no): {Style.RESET_ALL}").strip().lower()
         
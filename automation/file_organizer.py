@@ -8,14 +8,17 @@ Author: Python AI Automation Lab
 """
 
 import os
-import shutil
+import threading
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Set, Tuple, Union
 from colorama import init, Fore, Style
 
 # Initialize colorama for cross-platform colored output
 init(autoreset=True)
 
+# Banner string is constant, so format it once
+_BANNER = f"{Fore.CYAN}{'='*60}"
+
 
 class FileOrganizer:
     """Organizes files into categorized folders based on file extensions."""
@@ -31,17 +34,37 @@ class FileOrganizer:
         'Executables': ['.exe', '.msi', '.apk', '.app', '.deb', '.rpm'],
     }
     
-    def __init__(self, source_dir: str = ".", dry_run: bool = True):
+    # Reverse lookup built once: extension -> category
+    _EXT_TO_CATEGORY: Dict[str, str] = {
+        ext: category for category, exts in CATEGORIES.items() for ext in exts
+    }
+    
+    def __init__(self, source_dir: Union[str, Path] = ".", dry_run: bool = True):
         """
         Initialize the File Organizer.
         
         Args:
-            source_dir: Directory to organize (default: current directory)
+            source_dir: Directory to organize (default: current directory).
+                A Path is assumed to be already resolved and used as-is.
             dry_run: If True, only show what would be done without moving files
         """
-        self.source_dir = Path(source_dir).resolve()
+        self.source_dir = source_dir if isinstance(source_dir, Path) else Path(source_dir).resolve()
         self.dry_run = dry_run
         self.stats = {'moved': 0, 'skipped': 0, 'errors': 0}
+        self._stats_lock = threading.Lock()
+    
+    @staticmethod
+    def _suffix(name: str) -> str:
+        """
+        Return a file name's extension, following the same rules as Path.suffix.
+        
+        A dot at the very start or end of the name doesn't begin an
+        extension, but '..jpg' still has the extension '.jpg'.
+        """
+        i = name.rfind('.')
+        if 0 < i < len(name) - 1:
+            return name[i:]
+        return ''
     
     def get_category(self, file_path: Path) -> str:
         """
@@ -53,21 +76,32 @@ class FileOrganizer:
         Returns:
             Category name or 'Others' if no match found
         """
-        extension = file_path.suffix.lower()
+        return self._EXT_TO_CATEGORY.get(self._suffix(file_path.name).lower(), 'Others')
+    
+    def get_categories(self, file_names: List[str]) -> List[str]:
+        """
+        Determine the categories for many files at once.
         
-        for category, extensions in self.CATEGORIES.items():
-            if extension in extensions:
-                return category
+        Same result as calling get_category on each name, but works on
+        plain strings in one pass instead of building a Path per file.
         
-        return 'Others'
+        Args:
+            file_names: File names (not full paths)
+            
+        Returns:
+            Category name for each file, in the same order
+        """
+        lookup = self._EXT_TO_CATEGORY.get
+        suffix = self._suffix
+        return [lookup(suffix(name).lower(), 'Others') for name in file_names]
     
     def organize(self) -> None:
         """
         Organize files in the source directory into categorized folders.
         """
-        print(f"\n{Fore.CYAN}{'='*60}")
+        print(f"\n{_BANNER}")
         print(f"{Fore.CYAN}📁 Smart File Organizer")
-        print(f"{Fore.CYAN}{'='*60}\n")
+        print(f"{_BANNER}\n")
         
         if self.dry_run:
             print(f"{Fore.YELLOW}🔍 DRY RUN MODE - No files will be moved")
@@ -75,8 +109,10 @@ class FileOrganizer:
         
         print(f"📂 Scanning: {Fore.GREEN}{self.source_dir}\n")
         
-        # Get all files in the directory (not subdirectories)
-        files = [f for f in self.source_dir.iterdir() if f.is_file()]
+        # Get all files in the directory (not subdirectories). DirEntry caches
+        # the file type from the directory listing, so no extra stat per file.
+        with os.scandir(self.source_dir) as entries:
+            files = [entry for entry in entries if entry.is_file()]
         
         if not files:
             print(f"{Fore.YELLOW}⚠️  No files found to organize!")
@@ -84,53 +120,98 @@ class FileOrganizer:
         
         print(f"Found {Fore.GREEN}{len(files)}{Style.RESET_ALL} files to process\n")
         
-        # Process each file
-        for file_path in files:
-            try:
-                # Skip this script itself
-                if file_path.name == Path(__file__).name:
+        # First pass: classify every file (skipping this script itself)
+        script_name = Path(__file__).name
+        files = [entry for entry in files if entry.name != script_name]
+        categories = self.get_categories([entry.name for entry in files])
+        plan = list(zip(files, categories))
+        
+        # Create each needed category folder once, not once per file, and
+        # read the names already inside it so conflicts are resolved in memory.
+        # Names are case-folded because macOS and Windows filesystems treat
+        # 'photo.jpg' and 'Photo.JPG' as the same file.
+        taken_names: Dict[str, Set[str]] = {}
+        if not self.dry_run:
+            for category in {category for _, category in plan}:
+                try:
+                    category_dir = self.source_dir / category
+                    category_dir.mkdir(exist_ok=True)
+                    with os.scandir(category_dir) as existing:
+                        taken_names[category] = {e.name.casefold() for e in existing}
+                except Exception as e:
+                    print(f"  {Fore.RED}❌ Could not prepare {category}/: {str(e)}")
+        
+        # Second pass: pick each file's destination
+        moves: List[Tuple[str, Path]] = []
+        for entry, category in plan:
+            category_dir = self.source_dir / category
+            destination = category_dir / entry.name
+            
+            # Show what will happen
+            print(f"  {Fore.BLUE}📄 {entry.name}")
+            print(f"     → {Fore.GREEN}{category}/")
+            
+            if not self.dry_run:
+                # Without a listing of the folder, conflicts can't be detected
+                # and os.replace could overwrite a file, so skip the move
+                taken = taken_names.get(category)
+                if taken is None:
+                    print(f"     {Fore.RED}❌ Skipped: {category}/ could not be read")
+                    self.stats['errors'] += 1
                     continue
                 
-                category = self.get_category(file_path)
-                category_dir = self.source_dir / category
-                destination = category_dir / file_path.name
-                
-                # Show what will happen
-                print(f"  {Fore.BLUE}📄 {file_path.name}")
-                print(f"     → {Fore.GREEN}{category}/")
-                
-                if not self.dry_run:
-                    # Create category folder if it doesn't exist
-                    category_dir.mkdir(exist_ok=True)
-                    
-                    # Handle file name conflicts
-                    if destination.exists():
-                        base = destination.stem
-                        ext = destination.suffix
-                        counter = 1
-                        while destination.exists():
-                            destination = category_dir / f"{base}_{counter}{ext}"
-                            counter += 1
-                        print(f"     {Fore.YELLOW}⚠️  Renamed to: {destination.name}")
-                    
-                    # Move the file
-                    shutil.move(str(file_path), str(destination))
-                    self.stats['moved'] += 1
-                else:
-                    self.stats['moved'] += 1
+                # Handle file name conflicts
+                if entry.name.casefold() in taken:
+                    base = destination.stem
+                    ext = destination.suffix
+                    counter = 1
+                    candidate = f"{base}_{counter}{ext}"
+                    while candidate.casefold() in taken:
+                        counter += 1
+                        candidate = f"{base}_{counter}{ext}"
+                    destination = category_dir / candidate
+                    print(f"     {Fore.YELLOW}⚠️  Renamed to: {destination.name}")
                 
-            except Exception as e:
-                print(f"     {Fore.RED}❌ Error: {str(e)}")
-                self.stats['errors'] += 1
+                taken.add(destination.name.casefold())
+                moves.append((entry.path, destination))
+            else:
+                self.stats['moved'] += 1
+        
+        # Renames are I/O-bound and release the GIL, so run them concurrently
+        if moves:
+            # Imported here so dry runs don't pay for it
+            from concurrent.futures import ThreadPoolExecutor
+            
+            workers = min(32, (os.cpu_count() or 1) * 4)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(self._move_file, moves))
         
         # Print summary
         self._print_summary()
     
+    def _move_file(self, move: Tuple[str, Path]) -> None:
+        """
+        Move one file, recording the outcome in the stats.
+        
+        Args:
+            move: Tuple of (source path, destination path)
+        """
+        source, destination = move
+        try:
+            # A single atomic rename on the same filesystem
+            os.replace(source, destination)
+            with self._stats_lock:
+                self.stats['moved'] += 1
+        except Exception as e:
+            print(f"  {Fore.RED}❌ Error moving {Path(source).name}: {str(e)}")
+            with self._stats_lock:
+                self.stats['errors'] += 1
+    
     def _print_summary(self) -> None:
         """Print organization summary statistics."""
-        print(f"\n{Fore.CYAN}{'='*60}")
+        print(f"\n{_BANNER}")
         print(f"{Fore.CYAN}📊 Summary")
-        print(f"{Fore.CYAN}{'='*60}\n")
+        print(f"{_BANNER}\n")
         
         if self.dry_run:
             print(f"{Fore.GREEN}✓ {self.stats['moved']} files would be organized")
@@ -152,12 +233,15 @@ def main():
     if not source:
         source = "."
     
+    # Resolve once so the preview and the real run use the same folder
+    source_dir = Path(source).resolve()
+    
     # Confirm before proceeding
-    print(f"\n{Fore.YELLOW}This will organize files in: {Fore.GREEN}{Path(source).resolve()}")
+    print(f"\n{Fore.YELLOW}This will organize files in: {Fore.GREEN}{source_dir}")
     
     # First, do a dry run
     print(f"\n{Fore.CYAN}Running preview mode first...\n")
-    organizer = FileOrganizer(source_dir=source, dry_run=True)
+    organizer = FileOrganizer(source_dir=source_dir, dry_run=True)
     organizer.organize()
     
     # Ask if user wants to proceed
@@ -165,7 +249,7 @@ def main():
     
     if proceed in ['yes', 'y']:
         print(f"\n{Fore.GREEN}Organizing files...\n")
-        organizer = FileOrganizer(source_dir=source, dry_run=False)
+        organizer = FileOrganizer(source_dir=source_dir, dry_run=False)
         organizer.organize()
         print(f"{Fore.GREEN}✨ Done! Your files are now organized.\n")
     else:
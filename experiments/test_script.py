@@ -12,9 +12,21 @@ Feel free to modify this file and experiment with:
 Author: Python AI Automation Lab
 """
 
+import os
 from pathlib import Path
+from typing import List, Tuple
 from colorama import init, Fore, Style
 
+# Numba is optional - without it the same functions run as plain Python
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that leaves the function unchanged."""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
 # Initialize colorama for colored output
 init(autoreset=True)
 
@@ -39,6 +51,31 @@ def hello_automation():
     print(f"{Fore.CYAN}  organizer.organize()\n")
 
 
+def _scan_python_files(directory: Path, limit: int = 5) -> Tuple[int, List[str]]:
+    """
+    Count the .py files in a directory and collect the first few names.
+    
+    Uses a single os.scandir pass - no glob pattern matching, no Path
+    object or stat call per entry, and no full list of results.
+    
+    Args:
+        directory: Directory to scan
+        limit: How many file names to keep
+        
+    Returns:
+        Tuple of (total .py files, first `limit` file names)
+    """
+    count = 0
+    names: List[str] = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.endswith('.py') and entry.is_file():
+                count += 1
+                if len(names) < limit:
+                    names.append(entry.name)
+    return count, names
+
+
 def demo_file_operations():
     """
     Demo function showing basic file operations.
@@ -52,15 +89,42 @@ def demo_file_operations():
     print(f"Current directory: {Fore.GREEN}{current_dir}")
     
     # List files in current directory
-    files = list(current_dir.glob("*.py"))
-    print(f"\nPython files found: {Fore.GREEN}{len(files)}")
+    count, names = _scan_python_files(current_dir)  # Keep first 5
+    print(f"\nPython files found: {Fore.GREEN}{count}")
     
-    for file in files[:5]:  # Show first 5
-        print(f"  • {file.name}")
+    for name in names:
+        print(f"  • {name}")
     
     print()
 
 
+@njit(cache=True)
+def _count_words(data: bytes) -> int:
+    """
+    Count whitespace-separated words without building a list of them.
+    
+    Example of the @njit(cache=True) pattern: Numba compiles this loop to
+    machine code on first use and caches it on disk for later runs.
+    
+    Args:
+        data: ASCII/UTF-8 encoded text
+        
+    Returns:
+        Number of words (same as len(text.split()) for ASCII text)
+    """
+    count = 0
+    in_word = False
+    for byte in data:
+        # Space, \t, \n, \v, \f, \r and the \x1c-\x1f separators, i.e. every
+        # ASCII character str.split() treats as whitespace
+        if byte == 32 or 9 <= byte <= 13 or 28 <= byte <= 31:
+            in_word = False
+        elif not in_word:
+            in_word = True
+            count += 1
+    return count
+
+
 def demo_text_processing():
     """Demo function showing text processing."""
     print(f"{Fore.BLUE}📝 Text Processing Demo\n")
@@ -69,7 +133,7 @@ def demo_text_processing():
     
     print(f"Original: {sample_text}")
     print(f"Uppercase: {sample_text.upper()}")
-    print(f"Word count: {len(sample_text.split())}")
+    print(f"Word count: {_count_words(sample_text.encode())}")
     print(f"Character count: {len(sample_text)}\n")
 
 